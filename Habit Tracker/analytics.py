@@ -1,27 +1,22 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime
 from typing import List, Dict
-from database import Database
-from collections import defaultdict
+from database import Database, ROW_FMT, longest_run, format_recent_completions
+from collections import Counter
 import questionary
-import subprocess
 
 
-db = Database()
-
 def list_habits(frequency: str = None) -> List[Dict]:
 
     """Return all habits, optionally filtered by frequency."""
 
-    return db.load_habits(frequency)
+    return Database.get().load_habits(frequency)
 
 
-def recent_completions(habit_id: int, n: int = 5) -> List[datetime]:
+def recent_completions(habit_id: int, n: int = 5) -> List[date]:
     
     """Return the n most recent unique completion dates for a habit."""
 
-    completions = db.load_completions(habit_id)
-    unique_completions = sorted(set(completions), reverse=True)
-    return unique_completions[:n]
+    return Database.get().load_recent_completions(habit_id, n)
 
 
 def recent_completions_fp(completions: List[datetime], n: int = 5) -> List[datetime]:
@@ -31,15 +26,15 @@ def recent_completions_fp(completions: List[datetime], n: int = 5) -> List[datet
     return sorted(completions, reverse=True)[:n]
 
 
-def recent_completions_summary(habit_id: int) -> str:
+def recent_completions_summary(habit_id: int, completions: List[datetime] = None) -> str:
 
-    """Return summary of completions count and last completion date."""
+    """Return summary of completions count and last completion date, reusing preloaded completions if given."""
 
-    completions = db.load_completions(habit_id)
-    if not completions:
-        return "0 completions"
-    completions.sort(reverse=True)
-    return f"{len(completions)} completions, last: {completions[0].strftime('%Y-%m-%d')}"
+    if completions is None:
+        count, last = Database.get().get_completion_stats(habit_id)
+    else:
+        count, last = len(completions), max(completions, default=None)
+    return format_recent_completions(count, last)
 
 
 def longest_streak_for_habit_fp(habit: Dict, completions: List[datetime]) -> int:
@@ -51,43 +46,31 @@ def longest_streak_for_habit_fp(habit: Dict, completions: List[datetime]) -> int
 
     freq = habit['frequency']
     periodicity = habit['periodicity']
-    buckets = defaultdict(int)
-    for c in completions:
-        key = (c.date() if freq == 'daily' else c.date() - timedelta(days=c.weekday()))
-        buckets[key] += 1
+    if freq == 'daily':
+        buckets = Counter(c.toordinal() for c in completions)
+    else:
+        buckets = Counter(c.toordinal() - c.weekday() for c in completions)
 
     valid_periods = sorted(k for k, v in buckets.items() if v >= periodicity)
-    if not valid_periods:
-        return 0
-
-    streak = 0
-    longest = 0
-    prev = None
-    for period in valid_periods:
-        delta = (period - prev).days if prev else None
-        expected = 1 if freq == 'daily' else 7
+    return longest_run(valid_periods, 1 if freq == 'daily' else 7)
 
-        if prev and delta == expected:
-            streak += 1
 
-        else:
-            streak = 1
+def longest_streak_all(habits: List[Dict] = None, all_completions: Dict[int, List[datetime]] = None, db_instance=None):
 
-        longest = max(longest, streak)
-        prev = period
+    """Return the longest streak among all habits, loading completions the caller did not supply."""
 
-    return longest
-
-
-def longest_streak_all():
-
-    """Return the longest streak among all habits."""
-
-    habits = db.load_habits()
+    if habits is None:
+        habits = (db_instance or Database.get()).overview_snapshot()
+    all_completions = all_completions or {}
     best_streak = 0
     best_habits = []
     for h in habits:
-        streak = db.get_streaks(h['id'])['longest_streak']
+        streak = h.get('longest_streak')
+        if streak is None:
+            completions = all_completions.get(h['id'])
+            if completions is None:
+                completions = (db_instance or Database.get()).load_completions(h['id'])
+            streak = longest_streak_for_habit_fp(h, completions)
 
         if streak > best_streak:
             best_streak = streak
@@ -104,7 +87,7 @@ def habit_longest_streak(habit_id: int, db_instance=None) -> int:
     """Return the longest streak for a given habit ID."""
 
     if db_instance is None:
-        db_instance = db
+        db_instance = Database.get()
 
     return db_instance.get_streaks(habit_id)['longest_streak']
 
@@ -113,19 +96,19 @@ def period_summary(period="daily"):
 
     """Return summary of completions for the given period."""
 
-    return db.period_summary(period)
+    return Database.get().period_summary(period)
 
 
 
-if __name__ == "__main__":
+def run():
 
-    """Run analytics overview and interactive menu when executed directly."""
+    """Run analytics overview and interactive menu."""
 
+    db = Database.get()
     print("\n📊 Welcome to Habit Analytics!\n")
     print("Here’s an overview of your current habits:\n")
-    habits = db.load_habits()
-    print(f"{'ID':<3} | {'Habit Name':<20} | {'Freq':<6} | {'Periodicity':<11} | "
-          f"{'Current':<7} | {'Longest':<7} | {'Recent Completions'}")
+    habits = db.overview_snapshot()
+    print(ROW_FMT('ID', 'Habit Name', 'Freq', 'Periodicity', 'Current', 'Longest', 'Recent Completions'))
     print("-" * 100)
 
     if not habits:
@@ -133,53 +116,27 @@ if __name__ == "__main__":
         print("Tip: You can add habits using the CLI (py cli.py).\n")
 
     else:
+        rows = []
         for h in habits:
             habit_id = h['id']
             name = h['name']
             freq = h['frequency']
             period = h['periodicity']
-            streaks = db.get_streaks(habit_id)
-            current = streaks['current_streak']
-            longest = streaks['longest_streak']
-            completions = db.load_completions(habit_id)
-
-            if completions:
-                last_date = max(completions).strftime('%Y-%m-%d')
-                completions_count = len(completions)
-                recent_str = f"{completions_count} completions, last: {last_date}"
-
-            else:
-                recent_str = "0 completions"
-
-            print(f"{habit_id:<3} | {name:<20} | {freq:<6} | {period:<11} | "
-                  f"{current:<7} | {longest:<7} | {recent_str}")
-            
+            current = h['current_streak']
+            longest = h['longest_streak']
+            recent_str = format_recent_completions(h['count'], h['last'])
+            rows.append(ROW_FMT(habit_id, name, freq, period, current, longest, recent_str))
+
+        print("\n".join(rows))
         print("\n📈 Analytics Summary:\n")
-        best = longest_streak_all()
+        best = longest_streak_all(habits)
         if best["habits"]:
             habits_str = ", ".join(f"'{h}'" for h in best["habits"])
             print(f"🏆 Longest streak overall: {habits_str} with {best['longest_streak']} periods.")
 
-        today = datetime.now().date()
-        completed_today = 0
-        for h in habits:
-            completions = db.load_completions(h['id'])
-
-            if any(c.date() == today for c in completions):
-                completed_today += 1
-
+        completed_today, completed_week = db.count_habits_completed_today_and_week(datetime.now().date())
         total_habits = len(habits)
         print(f"📅 Today’s completions: {completed_today} out of {total_habits} habits.")
-        monday = today - timedelta(days=today.weekday())
-        sunday = monday + timedelta(days=6)
-        completed_week = 0
-
-        for h in habits:
-            completions = db.load_completions(h['id'])
-
-            if any(monday <= c.date() <= sunday for c in completions):
-                completed_week += 1
-
         print(f"📆 This week’s completions: {completed_week} out of {total_habits} habits.\n")
 
     print("\nℹ️  Use this table and analytics to understand your habits better.")
@@ -195,13 +152,21 @@ if __name__ == "__main__":
     ).ask()
 
     if move_to == "🏠 Run main.py":
-        subprocess.run(["py", "main.py"])
+        import main
+        main.run()
 
     elif move_to == "📂 Run database.py":
-        subprocess.run(["py", "database.py"])
+        import database
+        database.run()
 
     elif move_to == "▶ Run cli.py":
-        subprocess.run(["py", "cli.py"])
+        import cli
+        cli.run()
 
     else:
-        print("\n✅ Exiting Habit Tracker. Goodbye!\n")
\ No newline at end of file
+        print("\n✅ Exiting Habit Tracker. Goodbye!\n")
+
+
+
+if __name__ == "__main__":
+    run()
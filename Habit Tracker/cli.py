@@ -1,28 +1,23 @@
 import click
 import questionary
-import subprocess
-from main import Habit, db
-from datetime import datetime, timedelta
+from main import Habit
+from datetime import datetime
+from database import Database, ROW_FMT, format_recent_completions
 from analytics import (
-    recent_completions_summary,
     longest_streak_all,
-    period_summary,
-    habit_longest_streak
+    period_summary
 )
 
 
-def format_recent_completions(completions):
+def format_habit_rows(habits):
 
-    """Format a list of completions into a summary string."""
-    
-    if not completions:
-        return "0 completions"
-    
-    completions_sorted = sorted(completions, reverse=True)
-    count = len(completions_sorted)
-    last = completions_sorted[0].strftime('%Y-%m-%d')
+    """Format overview snapshot entries into table rows."""
 
-    return f"{count} completions, last: {last}"
+    return [
+        ROW_FMT(h['id'], h['name'], h['frequency'], h['periodicity'],
+                h['current_streak'], h['longest_streak'], format_recent_completions(h['count'], h['last']))
+        for h in habits
+    ]
 
 
 @click.group()
@@ -40,9 +35,9 @@ def add(name, frequency, periodicity):
 
     """Add a new habit."""
 
-    existing = next((h for h in db.load_habits() if h['name'] == name), None)
-    if existing:
-        click.echo(f"Habit '{name}' already exists with ID {existing['id']}.")
+    existing_id = Database.get().get_habit_id(name)
+    if existing_id is not None:
+        click.echo(f"Habit '{name}' already exists with ID {existing_id}.")
         return
 
     if periodicity < 1:
@@ -58,15 +53,10 @@ def list_habits():
 
     """List all habits with streaks in a table format."""
 
-    habits = db.load_habits()
-    click.echo(f"{'ID':<3} | {'Name':<20} | {'Freq':<6} | {'Periodicity':<11} | {'Current':<7} | {'Longest':<7} | {'Recent completions'}")
-    click.echo("-" * 120)
-
-    for h in habits:
-        streaks = db.get_streaks(h['id'])
-        recent_str = recent_completions_summary(h['id'])
-        print(f"{h['id']:<3} | {h['name']:<20} | {h['frequency']:<6} | {h['periodicity']:<11} | "
-            f"{streaks['current_streak']:<7} | {streaks['longest_streak']:<7} | {recent_str}")
+    habits = Database.get().overview_snapshot()
+    rows = [ROW_FMT('ID', 'Name', 'Freq', 'Periodicity', 'Current', 'Longest', 'Recent completions'), "-" * 120]
+    rows.extend(format_habit_rows(habits))
+    click.echo("\n".join(rows))
 
 
 @cli.command()
@@ -75,11 +65,6 @@ def done(habit_id):
 
     """Mark a habit as completed."""
 
-    habit_record = next((h for h in db.load_habits() if h['id'] == habit_id), None)   
-    if not habit_record:
-        click.echo(f"Habit ID {habit_id} does not exist.")
-        return
-
     habit = Habit.from_db(habit_id)
     if habit is None:
         click.echo(f"Habit ID {habit_id} does not exist.")
@@ -98,7 +83,7 @@ def delete(habit_id):
 
     """Delete a habit."""
 
-    db.delete_habit(habit_id)
+    Database.get().delete_habit(habit_id)
     click.echo(f"Habit ID {habit_id} deleted successfully!")
 
 
@@ -107,6 +92,15 @@ def interactive_menu():
 
     """Interactive menu for managing habits and viewing analytics."""
 
+    run()
+
+
+def run():
+
+    """Run the interactive habit management menu until the user exits."""
+
+    db = Database.get()
+
     while True:
         print()
         action = questionary.select(
@@ -127,19 +121,20 @@ def interactive_menu():
             name = questionary.text("Habit name:").ask()
             frequency = questionary.select("Frequency:", choices=["daily", "weekly"]).ask()
             periodicity = int(questionary.text("Times per period:").ask())
+            existing_id = db.get_habit_id(name)
+            if existing_id is not None:
+                print(f"Habit '{name}' already exists with ID {existing_id}.")
+                continue
+
             habit_id = db.add_habit(name, frequency, periodicity)
             habit = Habit(name, frequency, periodicity, db_instance=db, habit_id=habit_id)
             print(f"Habit '{habit.name}' added with ID {habit.id}")
 
         elif action == "List all habits":
-            habits = db.load_habits()
-            print(f"{'ID':<3} | {'Name':<20} | {'Freq':<6} | {'Periodicity':<11} | {'Current':<7} | {'Longest':<7} | {'Recent completions'}")
-
-            for h in habits:
-                streaks = db.get_streaks(h['id'])
-                recent_str = recent_completions_summary(h['id'])
-                print(f"{h['id']:<3} | {h['name']:<20} | {h['frequency']:<6} | {h['periodicity']:<11} | "
-                        f"{streaks['current_streak']:<7} | {streaks['longest_streak']:<7} | {recent_str}")
+            habits = db.overview_snapshot()
+            rows = [ROW_FMT('ID', 'Name', 'Freq', 'Periodicity', 'Current', 'Longest', 'Recent completions')]
+            rows.extend(format_habit_rows(habits))
+            print("\n".join(rows))
 
         elif action == "Mark habit as done":
             habit_id = int(questionary.text("Enter habit ID to mark as done:").ask())
@@ -163,9 +158,8 @@ def interactive_menu():
         elif action == "Show analytics":
             print("\n📊 Welcome to Habit Analytics!\n")
             print("Here’s an overview of your current habits:\n")
-            habits = db.load_habits()
-            print(f"{'ID':<3} | {'Habit Name':<20} | {'Freq':<6} | {'Periodicity':<11} | "
-                f"{'Current':<7} | {'Longest':<7} | {'Recent Completions'}")
+            habits = db.overview_snapshot()
+            print(ROW_FMT('ID', 'Habit Name', 'Freq', 'Periodicity', 'Current', 'Longest', 'Recent Completions'))
             print("-" * 100)
 
             if not habits:
@@ -173,53 +167,28 @@ def interactive_menu():
                 print("Tip: You can add habits using the CLI (py cli.py).\n")
 
             else:
+                rows = []
                 for h in habits:
                     habit_id = h['id']
                     name = h['name']
                     freq = h['frequency']
                     period = h['periodicity']
-                    streaks = db.get_streaks(habit_id)
-                    current = streaks['current_streak']
-                    longest = streaks['longest_streak']
-                    completions = db.load_completions(habit_id)
+                    current = h['current_streak']
+                    longest = h['longest_streak']
+                    recent_str = format_recent_completions(h['count'], h['last'])
+                    rows.append(ROW_FMT(habit_id, name, freq, period, current, longest, recent_str))
 
-                    if completions:
-                        last_date = max(completions).strftime('%Y-%m-%d')
-                        completions_count = len(completions)
-                        recent_str = f"{completions_count} completions, last: {last_date}"
-
-                    else:
-                        recent_str = "0 completions"
-
-                    print(f"{habit_id:<3} | {name:<20} | {freq:<6} | {period:<11} | "
-                        f"{current:<7} | {longest:<7} | {recent_str}")
+                print("\n".join(rows))
 
                 print("\n📈 Analytics Summary:\n")
-                best = longest_streak_all()
+                best = longest_streak_all(habits)
                 if best["habits"]:
                     habits_str = ", ".join(f"'{h}'" for h in best["habits"])
                     print(f"🏆 Longest streak overall: {habits_str} with {best['longest_streak']} periods.")
 
-                today = datetime.now().date()
-                completed_today = 0
-
-                for h in habits:
-                    completions = db.load_completions(h['id'])
-                    if any(c.date() == today for c in completions):
-                        completed_today += 1
-
+                completed_today, completed_week = db.count_habits_completed_today_and_week(datetime.now().date())
                 total_habits = len(habits)
                 print(f"📅 Today’s completions: {completed_today} out of {total_habits} habits.")
-
-                monday = today - timedelta(days=today.weekday())
-                sunday = monday + timedelta(days=6)
-                completed_week = 0
-
-                for h in habits:
-                    completions = db.load_completions(h['id'])
-                    if any(monday <= c.date() <= sunday for c in completions):
-                        completed_week += 1
-
                 print(f"📆 This week’s completions: {completed_week} out of {total_habits} habits.\n")
 
                 daily_summary = period_summary("daily")
@@ -229,16 +198,15 @@ def interactive_menu():
 
                 print("--- Per Habit Analytics ---")
                 for h in habits:
-                    completions = db.load_completions(h['id'])
-                    recent = recent_completions_summary(h['id'])
-                    longest = habit_longest_streak(h['id'])
+                    recent = format_recent_completions(h['count'], h['last'])
+                    longest = h['longest_streak']
                     print(f"\nHabit: {h['name']}")
                     print(f"   ✅ {recent}")
                     print(f"   🔥 Longest streak: {longest}")
 
-                    if completions:
-                        recent_unique = sorted(set(completions), reverse=True)
-                        recent_str = ", ".join(c.strftime('%Y-%m-%d') for c in recent_unique[:5])
+                    recent_days = db.load_recent_completions(h['id'])
+                    if recent_days:
+                        recent_str = ", ".join(d.isoformat() for d in recent_days)
                         print(f"   🕒 Last completions: {recent_str}")
 
                     else:
@@ -260,15 +228,10 @@ def interactive_menu():
                 if choice == "Yes, reset to defaults":
                     db.reset_to_default() 
                     print("✅ All habits reset to defaults with fixture data for 4 weeks.\n")
-                    habits = db.load_habits()
-                    print(f"{'ID':<3} | {'Name':<20} | {'Freq':<6} | {'Periodicity':<11} | {'Current':<7} | {'Longest':<7} | {'Recent completions'}")
-                    print("-" * 100)
-
-                    for h in habits:
-                        streaks = db.get_streaks(h['id'])
-                        recent_str = recent_completions_summary(h['id'])
-                        print(f"{h['id']:<3} | {h['name']:<20} | {h['frequency']:<6} | {h['periodicity']:<11} | "
-                            f"{streaks['current_streak']:<7} | {streaks['longest_streak']:<7} | {recent_str}")
+                    habits = db.overview_snapshot()
+                    rows = [ROW_FMT('ID', 'Name', 'Freq', 'Periodicity', 'Current', 'Longest', 'Recent completions'), "-" * 100]
+                    rows.extend(format_habit_rows(habits))
+                    print("\n".join(rows))
 
                 elif choice == "No, cancel":
                     print("❌ Reset canceled.")
@@ -282,15 +245,11 @@ def interactive_menu():
                         {"name": "Clean Room", "frequency": "weekly", "periodicity": 2, "current": 4, "longest": 4, "recent": "8 completions, last: 2025-09-01"},
                     ]
 
-                    print(f"{'ID':<3} | {'Name':<20} | {'Freq':<6} | {'Periodicity':<11} | {'Current':<7} | {'Longest':<7} | {'Recent completions'}")
-                    print("-" * 100)
-
+                    rows = [ROW_FMT('ID', 'Name', 'Freq', 'Periodicity', 'Current', 'Longest', 'Recent completions'), "-" * 100]
                     for idx, h in enumerate(default_habits_data, start=1):
-                        current_streak = h['current']
-                        longest_streak = h['longest']
-                        recent_str = h['recent']
-                        print(f"{idx:<3} | {h['name']:<20} | {h['frequency']:<6} | {h['periodicity']:<11} | "
-                            f"{current_streak:<7} | {longest_streak:<7} | {recent_str}")
+                        rows.append(ROW_FMT(idx, h['name'], h['frequency'], h['periodicity'],
+                                            h['current'], h['longest'], h['recent']))
+                    print("\n".join(rows))
 
         elif action == "Reset entire database (empty)":
             confirm = questionary.select(
@@ -331,13 +290,16 @@ def interactive_menu():
                 ).ask()
 
                 if next_action == "▶ Run main.py":
-                    subprocess.run(["py", "main.py"])
+                    import main
+                    main.run()
 
                 elif next_action == "🗄 Run database.py":
-                    subprocess.run(["py", "database.py"])
+                    import database
+                    database.run()
 
                 elif next_action == "📊 Run analytics.py":
-                    subprocess.run(["py", "analytics.py"])
+                    import analytics
+                    analytics.run()
 
                 else:
                     print("\n👋 Fully exited. You can restart anytime.\n")
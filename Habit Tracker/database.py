@@ -1,10 +1,50 @@
 import sqlite3
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict
-import subprocess
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Dict, Tuple
+from collections import Counter
 import questionary
 
 
+_INSTANCE = None
+FIXTURE_VERSION = 1
+ROW_FMT = "{:<3} | {:<20} | {:<6} | {:<11} | {:<7} | {:<7} | {}".format
+
+INSERT_COMPLETION = "INSERT INTO completions (habit_id, completion_date) VALUES (?, ?)"
+COUNT_COMPLETIONS_IN_PERIOD = """
+SELECT COUNT(*) FROM (
+    SELECT 1 FROM completions
+    WHERE habit_id = ? AND completion_date >= ? AND completion_date < ?
+    LIMIT ?
+)
+"""
+
+
+def longest_run(periods: List[int], step: int) -> int:
+
+    """
+    Returns the length of the longest run in a sorted list of period ordinals,
+    where consecutive periods are exactly `step` days apart.
+    All members of a run share the same value of `period - index * step`,
+    so runs are counted in one pass without comparing neighbours.
+    """
+
+    if not periods:
+        return 0
+    return max(Counter(p - i * step for i, p in enumerate(periods)).values())
+
+
+def format_recent_completions(count: int, last: Optional[datetime]) -> str:
+
+    """
+    Formats a habit's completion count and latest completion into the
+    "N completions, last: YYYY-MM-DD" summary shown in the overview tables.
+    """
+
+    if not count:
+        return "0 completions"
+    return f"{count} completions, last: {last.strftime('%Y-%m-%d')}"
+
+
 class Database:
 
     """
@@ -18,15 +58,43 @@ class Database:
 
         """
         Initializes a Database object, connects to the SQLite database at db_path,
-        sets row_factory to access columns by name, creates tables if they don't exist,
-        and populates fixture data for demonstration.
+        sets row_factory to access columns by name, enables foreign keys so deleting a habit cascades
+        to its completions, enables WAL journaling with relaxed syncing,
+        creates tables if they don't exist, and populates fixture data for demonstration.
+        Fixture data is added at most once per database: the PRAGMA user_version records that
+        the fixture check has run, so later opens skip it. reset_empty() clears the marker.
+        The same first open runs ANALYZE so the query planner has statistics for the indexes.
         """
 
         self.db_path = db_path
         self.conn = sqlite3.connect(self.db_path)
         self.conn.row_factory = sqlite3.Row  
+        self._habits_cache = None
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA mmap_size=268435456")
         self.create_tables()
-        self.generate_fixture_data()
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < FIXTURE_VERSION:
+            if self.conn.execute("SELECT 1 FROM habits LIMIT 1").fetchone() is None:
+                self.generate_fixture_data()
+            self.conn.execute("ANALYZE")
+            self.conn.execute(f"PRAGMA user_version = {FIXTURE_VERSION}")
+
+
+    @classmethod
+    def get(cls):
+
+        """
+        Returns the shared Database instance for the default habits.db file.
+        The connection is opened on first use and reused by every module afterwards.
+        """
+
+        global _INSTANCE
+        if _INSTANCE is None:
+            _INSTANCE = cls()
+        return _INSTANCE
 
 
     def create_tables(self):
@@ -35,6 +103,9 @@ class Database:
         Creates the required tables `habits` and `completions` if they do not exist.
         - `habits`: stores id, name, frequency, periodicity, creation_date
         - `completions`: stores habit_id, completion_date, with a foreign key constraint
+        Also creates indexes on completions(habit_id, completion_date), completions(completion_date)
+        and habits(name) so lookups and date range filters avoid full table scans.
+        Falls back to a non-unique name index if the database already contains duplicate habit names.
         Commits changes to the database.
         """
 
@@ -59,6 +130,15 @@ class Database:
         )
         """)
 
+        cursor.execute("DROP INDEX IF EXISTS idx_completions_habit")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_completions_habit_date ON completions(habit_id, completion_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_completions_date ON completions(completion_date)")
+
+        try:
+            cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_habits_name ON habits(name)")
+        except sqlite3.IntegrityError:
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_habits_name ON habits(name)")
+
         self.conn.commit()
 
 
@@ -66,6 +146,7 @@ class Database:
 
         """
         Inserts a new habit into the `habits` table with the given name, frequency, and periodicity.
+        The new habit is added to the in-memory habit cache (if loaded) instead of clearing it.
         Returns the auto-generated id of the inserted habit.
         """
 
@@ -76,7 +157,13 @@ class Database:
         VALUES (?, ?, ?, ?)
         """, (name, frequency, periodicity, creation_date))
         self.conn.commit()
-        return cursor.lastrowid
+        habit_id = cursor.lastrowid
+        if self._habits_cache is not None:
+            self._habits_cache[habit_id] = {
+                'id': habit_id, 'name': name, 'frequency': frequency,
+                'periodicity': periodicity, 'creation_date': creation_date
+            }
+        return habit_id
 
         
     def add_completion(self, habit_id: int, completion_date: Optional[datetime] = None):
@@ -89,12 +176,23 @@ class Database:
 
         if completion_date is None:
             completion_date = datetime.now()
-        cursor = self.conn.cursor()
-        cursor.execute("""
-        INSERT INTO completions (habit_id, completion_date)
-        VALUES (?, ?)
-        """, (habit_id, completion_date.isoformat()))
+        self.conn.execute(INSERT_COMPLETION, (habit_id, completion_date.isoformat()))
         self.conn.commit()
+
+
+    def add_completions_bulk(self, rows: List[Tuple[int, datetime]]):
+
+        """
+        Records many completions at once from a list of (habit_id, completion_date) tuples.
+        All rows are inserted with a single executemany call inside one transaction,
+        so the database is committed only once.
+        """
+
+        with self.conn:
+            self.conn.executemany(
+                INSERT_COMPLETION,
+                [(habit_id, completion_date.isoformat()) for habit_id, completion_date in rows]
+            )
     
 
     def load_habits(self, frequency: Optional[str] = None) -> List[Dict]:
@@ -102,32 +200,171 @@ class Database:
         """
         Loads habits from the database.
         If frequency is specified, filters habits by that frequency ('daily' or 'weekly').
+        Habits are read once and kept in an in-memory cache keyed by id until the next write.
         Returns a list of dictionaries representing each habit.
         """
 
-        cursor = self.conn.cursor()
-        if frequency:
-            cursor.execute("SELECT * FROM habits WHERE frequency = ?", (frequency,))
-        else:
-            cursor.execute("SELECT * FROM habits")
-        rows = cursor.fetchall()
-        habits = [dict(row) for row in rows]
-        return habits
+        habits = self._load_habits_cache().values()
+        return [dict(h) for h in habits if not frequency or h['frequency'] == frequency]
+
+
+    def _load_habits_cache(self) -> Dict[int, Dict]:
+
+        """
+        Returns the in-memory {id: habit} cache, querying the `habits` table if it is empty.
+        add_habit and delete_habit keep the cache in step; the reset methods clear it.
+        """
+
+        if self._habits_cache is None:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT * FROM habits ORDER BY id")
+            self._habits_cache = {row['id']: dict(row) for row in cursor.fetchall()}
+        return self._habits_cache
     
 
+    def load_habit(self, habit_id: int) -> Optional[Dict]:
+
+        """
+        Loads a single habit by its primary key from the in-memory habit cache.
+        Returns a dictionary representing the habit, or None if it does not exist.
+        """
+
+        habit = self._load_habits_cache().get(habit_id)
+        return dict(habit) if habit else None
+
+
+    def get_habit_id(self, name: str) -> Optional[int]:
+
+        """
+        Looks up a habit by its name using the habits(name) index.
+        Returns the id of the matching habit, or None if no habit has that name.
+        """
+
+        row = self.conn.execute("SELECT id FROM habits WHERE name = ? LIMIT 1", (name,)).fetchone()
+        return row['id'] if row else None
+
+
     def load_completions(self, habit_id: int) -> List[datetime]:
 
         """
         Retrieves all completion dates for a given habit_id as datetime objects.
-        Returns a list of completion datetimes.
+        Returns a list of completion datetimes in chronological order.
         """
 
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT completion_date FROM completions WHERE habit_id = ?", (habit_id,))
-        rows = cursor.fetchall()
+        rows = self.conn.execute(
+            "SELECT completion_date FROM completions WHERE habit_id = ? ORDER BY completion_date", (habit_id,)
+        ).fetchall()
         return [datetime.fromisoformat(row['completion_date']) for row in rows]
 
 
+    def count_completions_in_period(self, habit_id: int, start: date, end: date,
+                                    limit: Optional[int] = None) -> int:
+
+        """
+        Counts the completions of a given habit_id in the half-open range [start, end).
+        The count is answered from the (habit_id, completion_date) index without loading any rows.
+        If limit is given, the index scan stops after `limit` matches, so the result is at most limit;
+        this is enough for callers that only compare the count against a threshold.
+        Returns an integer count.
+        """
+
+        params = (habit_id, start.isoformat(), end.isoformat(), -1 if limit is None else limit)
+        return self.conn.execute(COUNT_COMPLETIONS_IN_PERIOD, params).fetchone()[0]
+
+
+    def get_completion_stats(self, habit_id: int) -> Tuple[int, Optional[datetime]]:
+
+        """
+        Computes the number of completions and the latest completion date for a given habit_id in SQL.
+        Returns a tuple (count, last_completion); last_completion is None if the habit has no completions.
+        """
+
+        count, last = self.conn.execute(
+            "SELECT COUNT(*), MAX(completion_date) FROM completions WHERE habit_id = ?", (habit_id,)
+        ).fetchone()
+        return count, datetime.fromisoformat(last) if last else None
+
+
+    def load_recent_completions(self, habit_id: int, n: int = 5) -> List[date]:
+
+        """
+        Retrieves the n most recent days on which a given habit_id was completed.
+        Rows are read newest first by walking the (habit_id, completion_date) index backwards, and
+        reading stops once n distinct days are found, so older history is never scanned.
+        Returns a list of dates, newest first.
+        """
+
+        cursor = self.conn.cursor()
+        cursor.execute("""
+        SELECT substr(completion_date, 1, 10) FROM completions
+        WHERE habit_id = ?
+        ORDER BY completion_date DESC
+        """, (habit_id,))
+        days = []
+        for (day,) in cursor:
+            if days and days[-1] == day:
+                continue
+            if len(days) == n:
+                break
+            days.append(day)
+        cursor.close()
+        return [date.fromisoformat(day) for day in days]
+
+
+    def count_habits_completed_today_and_week(self, today: date) -> Tuple[int, int]:
+
+        """
+        Counts the distinct existing habits completed on `today` and during its Monday-to-Sunday week.
+        Both numbers come from a single query over the week's completions, joined to `habits` so
+        completions left behind by deleted habits are not counted.
+        Returns a tuple (completed_today, completed_week).
+        """
+
+        monday = today - timedelta(days=today.weekday())
+        cursor = self.conn.cursor()
+        cursor.execute("""
+        SELECT DISTINCT c.habit_id, substr(c.completion_date, 1, 10) AS day
+        FROM completions c JOIN habits h ON h.id = c.habit_id
+        WHERE c.completion_date >= ? AND c.completion_date < ?
+        """, (monday.isoformat(), (monday + timedelta(days=7)).isoformat()))
+
+        today_iso = today.isoformat()
+        habits_today = set()
+        habits_week = set()
+        for row in cursor.fetchall():
+            habits_week.add(row['habit_id'])
+            if row['day'] == today_iso:
+                habits_today.add(row['habit_id'])
+        return len(habits_today), len(habits_week)
+
+
+    def overview_snapshot(self) -> List[Dict]:
+
+        """
+        Builds everything the habit overview tables need with two aggregate queries.
+        Returns a list of habit dictionaries (id, name, frequency, periodicity) extended with `count` and
+        `last` (number and latest of the habit's completions, counted in SQL with GROUP BY) and
+        `current_streak` / `longest_streak`, taken from one load_streaks() query.
+        """
+
+        cursor = self.conn.cursor()
+        cursor.execute("""
+        SELECT h.id, h.name, h.frequency, h.periodicity,
+               COUNT(c.id) AS count, MAX(c.completion_date) AS last
+        FROM habits h LEFT JOIN completions c ON c.habit_id = h.id
+        GROUP BY h.id
+        ORDER BY h.id
+        """)
+        streaks = self.load_streaks()
+        snapshot = []
+        for row in cursor.fetchall():
+            h = dict(row)
+            h['last'] = datetime.fromisoformat(h['last']) if h['last'] else None
+            h.update(streaks.get(h['id'], {"current_streak": 0, "longest_streak": 0}))
+            snapshot.append(h)
+        return snapshot
+
+
     def delete_habit(self, habit_id: int):
 
         """
@@ -139,21 +376,23 @@ class Database:
         cursor = self.conn.cursor()
         cursor.execute("DELETE FROM habits WHERE id = ?", (habit_id,))
         self.conn.commit()
+        if self._habits_cache is not None:
+            self._habits_cache.pop(habit_id, None)
     
 
     def reset_to_default(self):
 
         """
         Clears all habits and completions and resets SQLite autoincrement sequences.
-        Then generates fixture/default data for demonstration.
+        All deletes run in a single transaction before generating fixture/default data for demonstration.
         """
         
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM completions")
-        cursor.execute("DELETE FROM habits")
-        cursor.execute("DELETE FROM sqlite_sequence WHERE name='habits'")
-        cursor.execute("DELETE FROM sqlite_sequence WHERE name='completions'")
-        self.conn.commit()
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("DELETE FROM completions")
+            cursor.execute("DELETE FROM habits")
+            cursor.execute("DELETE FROM sqlite_sequence WHERE name IN ('habits', 'completions')")
+        self._habits_cache = None
         self.generate_fixture_data()
 
 
@@ -184,95 +423,93 @@ class Database:
         Calculates the current and longest streaks for a given habit.
         - For daily habits: counts consecutive days meeting the periodicity requirement.
         - For weekly habits: counts consecutive weeks meeting the periodicity requirement.
+        The streaks are computed in SQL by load_streaks(), restricted to this habit.
         Returns a dictionary: {"current_streak": int, "longest_streak": int}.
         """
-        
-        completions = sorted(self.load_completions(habit_id))
-        if not completions:
-            return {"current_streak": 0, "longest_streak": 0}
 
-        habit = next((h for h in self.load_habits() if h['id'] == habit_id), None)
-        if habit is None:
-            return {"current_streak": 0, "longest_streak": 0}
+        return self.load_streaks(habit_id).get(habit_id, {"current_streak": 0, "longest_streak": 0})
 
-        freq = habit['frequency']
-        periodicity = habit['periodicity']
-        now = datetime.now()
-        current_streak = 0
-        longest_streak = 0
-        
-        if freq == "daily":
-            days = {}
-            for c in completions:
-                d = c.date()
-                days[d] = days.get(d, 0) + 1
-
-            valid_days = sorted(d for d, count in days.items() if count >= periodicity)
-
-            day = now.date()
-            while day in valid_days:
-                current_streak += 1
-                day -= timedelta(days=1)
-
-            streak = 0
-            prev = None
-            for d in valid_days:
-                if prev and (d - prev).days == 1:
-                    streak += 1
-                else:
-                    streak = 1
-                longest_streak = max(longest_streak, streak)
-                prev = d
-
-        elif freq == "weekly":
-            weeks = {}
-            for c in completions:
-                monday = c.date() - timedelta(days=c.weekday())
-                weeks[monday] = weeks.get(monday, 0) + 1
-
-            valid_weeks = sorted(w for w, count in weeks.items() if count >= periodicity)
-
-            this_week = now.date() - timedelta(days=now.weekday())
-            while this_week in valid_weeks:
-                current_streak += 1
-                this_week -= timedelta(days=7)
-
-            streak = 0
-            prev = None
-            for w in valid_weeks:
-                if prev and (w - prev).days == 7:
-                    streak += 1
-                else:
-                    streak = 1
-                longest_streak = max(longest_streak, streak)
-                prev = w
 
+    def load_streaks(self, habit_id: Optional[int] = None) -> Dict[int, Dict[str, int]]:
+
+        """
+        Calculates current and longest streaks for all habits (or only habit_id) in one SQL query.
+        Completions are grouped into days or Monday-based weeks, periods below the periodicity are dropped,
+        and runs of consecutive periods are found with ROW_NUMBER() (period minus row number is constant
+        within a run). The current streak counts the periods up to and including today (daily) or this
+        week (weekly) in the run containing it, so completions dated in the future do not reset it.
+        Returns a dictionary {habit_id: {"current_streak": int, "longest_streak": int}};
+        habits without any valid period are left out.
+        """
+
+        today = datetime.now().date()
+        monday = today - timedelta(days=today.weekday())
+        habit_filter = "WHERE c.habit_id = ?" if habit_id is not None else ""
+        params = (habit_id,) if habit_id is not None else ()
+
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+        WITH periods AS (
+            SELECT c.habit_id,
+                   CASE h.frequency WHEN 'weekly' THEN date(c.completion_date, 'weekday 0', '-6 days')
+                                    ELSE date(c.completion_date) END AS period,
+                   CASE h.frequency WHEN 'weekly' THEN 7 ELSE 1 END AS step
+            FROM completions c JOIN habits h ON h.id = c.habit_id
+            {habit_filter}
+            GROUP BY c.habit_id, period, h.frequency, h.periodicity
+            HAVING COUNT(*) >= h.periodicity
+        ),
+        runs AS (
+            SELECT habit_id, step, COUNT(*) AS length, MIN(period) AS first_period, MAX(period) AS last_period
+            FROM (
+                SELECT habit_id, period, step,
+                       julianday(period) - step * ROW_NUMBER() OVER (PARTITION BY habit_id ORDER BY period) AS grp
+                FROM periods
+            )
+            GROUP BY habit_id, grp
+        )
+        SELECT habit_id,
+               MAX(CASE WHEN anchor BETWEEN first_period AND last_period
+                        THEN CAST((julianday(anchor) - julianday(first_period)) / step AS INTEGER) + 1
+                        ELSE 0 END) AS current_streak,
+               MAX(length) AS longest_streak
+        FROM (SELECT *, CASE step WHEN 7 THEN ? ELSE ? END AS anchor FROM runs)
+        GROUP BY habit_id
+        """, params + (monday.isoformat(), today.isoformat()))
         return {
-            "current_streak": current_streak,
-            "longest_streak": longest_streak
+            row['habit_id']: {"current_streak": row['current_streak'], "longest_streak": row['longest_streak']}
+            for row in cursor.fetchall()
         }
 
 
     def period_summary(self, period: str = "daily") -> Dict[str,int]:
 
         """
-        Summarizes habits for a given period ('daily' or 'weekly').
+        Summarizes the habits of a given frequency ('daily' or 'weekly') for the current period,
+        which starts at midnight today for daily habits and at Monday midnight for weekly habits.
+        Completions since the period start are counted per habit in a single grouped query.
         Returns a dictionary with counts of completed and missed habits in that period.
         """
         
         completed = 0
         missed = 0
-        habits = self.load_habits()
-        now = datetime.now()
+        today = date.today()
+        if period == "daily":
+            period_start = today
+        else:
+            period_start = today - timedelta(days=today.weekday())
 
-        for habit in habits:
-            comps = self.load_completions(habit['id'])
-            if period == "daily":
-                period_start = datetime(now.year, now.month, now.day)
-            else:
-                period_start = now - timedelta(days=now.weekday())
-            count = sum(1 for c in comps if c >= period_start)
-            if count >= habit['periodicity']:
+        cursor = self.conn.cursor()
+        cursor.execute("""
+        SELECT h.periodicity, COUNT(c.id) AS count
+        FROM habits h LEFT JOIN completions c
+            ON c.habit_id = h.id AND c.completion_date >= ?
+        WHERE h.frequency = ?
+        GROUP BY h.id
+        """, (period_start.isoformat(), period))
+
+        for row in cursor.fetchall():
+            if row['count'] >= row['periodicity']:
                 completed += 1
             else:
                 missed += 1
@@ -287,21 +524,19 @@ class Database:
         Returns an integer count.
         """
 
-        habit = next((h for h in self.load_habits() if h['id'] == habit_id), None)
+        habit = self.load_habit(habit_id)
         if not habit:
             return 0
 
-        completions = self.load_completions(habit_id)
-        now = datetime.now()
+        today = date.today()
         freq = habit['frequency']
 
         if freq == 'daily':
-            period_start = datetime(now.year, now.month, now.day)
-            count = sum(1 for c in completions if c >= period_start)
+            count = self.count_completions_in_period(habit_id, today, today + timedelta(days=1))
 
         elif freq == 'weekly':
-            period_start = now - timedelta(days=now.weekday())
-            count = sum(1 for c in completions if c >= period_start)
+            monday = today - timedelta(days=today.weekday())
+            count = self.count_completions_in_period(habit_id, monday, monday + timedelta(days=7))
 
         else:
             count = 0
@@ -315,7 +550,8 @@ class Database:
         Generates sample habits and completions for demonstration purposes.
         - Daily habits: 28 days of completions
         - Weekly habits: 4 weeks of completions
-        Ensures not to duplicate existing habits.
+        Ensures not to duplicate existing habits. The completion dates are computed once for all habits
+        and every completion is inserted in one batch.
         """
         
         habits_data = [
@@ -326,25 +562,24 @@ class Database:
             {"name": "Clean Room", "frequency": "weekly", "periodicity": 2},
         ]
 
+        now = datetime.now()
+        this_monday = now - timedelta(days=now.weekday())
+        periods = {
+            'daily': [now - timedelta(days=i) for i in range(28)],
+            'weekly': [this_monday - timedelta(weeks=i) for i in range(4)],
+        }
+
         existing_habits = {h['name'] for h in self.load_habits()}
+        rows = []
         for h in habits_data:
             if h['name'] in existing_habits:
                 continue  
 
             habit_id = self.add_habit(h['name'], h['frequency'], h['periodicity'])
-            now = datetime.now()
-
-            if h['frequency'] == 'daily':
-                for i in range(28):
-                    day = now - timedelta(days=i)
-                    for _ in range(h['periodicity']):
-                        self.add_completion(habit_id, day)
+            rows.extend((habit_id, day) for day in periods[h['frequency']] for _ in range(h['periodicity']))
 
-            else:
-                for i in range(4):
-                    week_start = now - timedelta(days=now.weekday() + 7*i)
-                    for _ in range(h['periodicity']):
-                        self.add_completion(habit_id, week_start)
+        if rows:
+            self.add_completions_bulk(rows)
 
 
     def reset_empty(self):
@@ -352,18 +587,21 @@ class Database:
         """
         Clears all habits and completions and resets SQLite autoincrement sequences.
         Useful for starting with a completely empty database.
+        Also resets the fixture marker, so default habits are added again the next time the database is opened.
+        The deletes and the marker reset run in a single transaction.
         """
 
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM completions")
-        cursor.execute("DELETE FROM habits")
-        cursor.execute("DELETE FROM sqlite_sequence WHERE name='habits'")
-        cursor.execute("DELETE FROM sqlite_sequence WHERE name='completions'")
-        self.conn.commit()
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("DELETE FROM completions")
+            cursor.execute("DELETE FROM habits")
+            cursor.execute("DELETE FROM sqlite_sequence WHERE name IN ('habits', 'completions')")
+            cursor.execute("PRAGMA user_version = 0")
+        self._habits_cache = None
 
 
 
-if __name__ == "__main__":
+def run():
 
     """
     Entry point for the database demonstration script.
@@ -379,15 +617,14 @@ if __name__ == "__main__":
        - Run cli.py
        - Run analytics.py
        - Exit
-    Uses `questionary` for interactive CLI selections and `subprocess` to run other scripts.
+    Uses `questionary` for interactive CLI selections and calls the chosen module's `run()` in the same process.
     """
 
-    db = Database()
-    habits = db.load_habits()
+    db = Database.get()
+    habits = db.overview_snapshot()
 
     print("\nℹ️  This table shows your current habits and streaks.\n")
-    print(f"{'ID':<3} | {'Habit Name':<20} | {'Freq':<6} | {'Periodicity':<11} | "
-          f"{'Current':<7} | {'Longest':<7} | {'Recent Completions'}")
+    print(ROW_FMT('ID', 'Habit Name', 'Freq', 'Periodicity', 'Current', 'Longest', 'Recent Completions'))
     print("-" * 100)
 
     for h in habits:
@@ -395,21 +632,11 @@ if __name__ == "__main__":
         name = h['name']
         freq = h['frequency']
         period = h['periodicity']
-        streaks = db.get_streaks(habit_id)
-        current = streaks['current_streak']
-        longest = streaks['longest_streak']
-        completions = db.load_completions(habit_id)
+        current = h['current_streak']
+        longest = h['longest_streak']
+        recent_str = format_recent_completions(h['count'], h['last'])
 
-        if completions:
-            last_date = max(completions).strftime('%Y-%m-%d')
-            completions_count = len(completions)
-            recent_str = f"{completions_count} completions, last: {last_date}"
-
-        else:
-            recent_str = "0 completions"
-
-        print(f"{habit_id:<3} | {name:<20} | {freq:<6} | {period:<11} | "
-              f"{current:<7} | {longest:<7} | {recent_str}")
+        print(ROW_FMT(habit_id, name, freq, period, current, longest, recent_str))
         
     move_to = questionary.select(
         "Move to:",
@@ -422,13 +649,23 @@ if __name__ == "__main__":
     ).ask()
 
     if move_to == "🏠 Run main.py":
-        subprocess.run(["py", "main.py"])
+        import main
+        main.run()
 
     elif move_to == "▶ Run cli.py":
-        subprocess.run(["py", "cli.py"])
+        import cli
+        cli.run()
 
     elif move_to == "📊 Run analytics.py":
-        subprocess.run(["py", "analytics.py"])
+        import analytics
+        analytics.run()
 
     else:
-        print("\n✅ Exiting Habit Tracker. Goodbye!\n")
\ No newline at end of file
+        print("\n✅ Exiting Habit Tracker. Goodbye!\n")
+
+
+
+if __name__ == "__main__":
+    # Run through the importable `database` module so the other modules share its Database.get() instance.
+    import database
+    database.run()
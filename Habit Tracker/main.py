@@ -1,14 +1,10 @@
 from datetime import datetime, timedelta
 from collections import defaultdict
-from database import Database
+from database import Database, ROW_FMT, format_recent_completions
 from analytics import longest_streak_for_habit_fp, recent_completions_fp
-import subprocess
 import questionary
 
 
-db = Database()
-
-
 class Habit:
 
     """
@@ -22,21 +18,32 @@ class Habit:
 
         """
         Creates a Habit instance from a database record using its habit_id.
-        It searches the database for a habit with the given ID and initializes an object with its attributes (name, frequency, periodicity, creation_date).
+        It looks up the habit with the given ID in the database and initializes an object with its attributes (name, frequency, periodicity, creation_date).
         If no matching record is found, it returns None.
         """
 
-        db_inst = db_instance if db_instance else db
-        record = next((h for h in db_inst.load_habits() if h['id'] == habit_id), None)
+        db_inst = db_instance if db_instance else Database.get()
+        record = db_inst.load_habit(habit_id)
         if not record:
             return None
+        return cls.from_record(record, db_inst)
+
+
+    @classmethod
+    def from_record(cls, record: dict, db_instance=None):
+
+        """
+        Creates a Habit instance from a habit dictionary the caller already holds (e.g. from load_habits()),
+        so no database lookup is needed.
+        """
+
         obj = cls.__new__(cls)
         obj.name = record['name']
         obj.frequency = record['frequency']
         obj.periodicity = record['periodicity']
-        obj.id = habit_id
+        obj.id = record['id']
         obj.creation_date = datetime.fromisoformat(record['creation_date'])
-        obj.db = db_inst
+        obj.db = db_instance if db_instance else Database.get()
         return obj
 
 
@@ -44,14 +51,14 @@ class Habit:
 
         """
         Initializes a new Habit object with provided name, frequency, periodicity, and optionally a habit_id and database instance.
-        If no database instance is provided, it creates a default Database() object.
+        If no database instance is provided, it uses the shared Database.get() instance.
         """
 
         self.id = habit_id
         self.name = name
         self.frequency = frequency
         self.periodicity = periodicity
-        self.db = db_instance if db_instance else Database()
+        self.db = db_instance if db_instance else Database.get()
 
 
     def performed(self):
@@ -95,27 +102,26 @@ class Habit:
         Determines whether the habit can be marked as completed for the current period.
         - For daily habits, checks if the habit has been performed fewer times than its `periodicity` today.
         - For weekly habits, checks if the habit has been performed fewer times than its `periodicity` in the current week.
+        Counting stops as soon as `periodicity` completions are found.
         Returns True if it can be marked, False otherwise.
         """
 
-        completions = self.db.load_completions(self.id)
-        now = datetime.now()
+        today = datetime.now().date()
 
         if self.frequency == "daily":
-            today_count = sum(1 for c in completions if c.date() == now.date())
+            today_count = self.db.count_completions_in_period(self.id, today, today + timedelta(days=1), limit=self.periodicity)
             return today_count < self.periodicity
 
         elif self.frequency == "weekly":
-            monday = now - timedelta(days=now.weekday())
-            sunday = monday + timedelta(days=6)
-            week_count = sum(1 for c in completions if monday.date() <= c.date() <= sunday.date())
+            monday = today - timedelta(days=today.weekday())
+            week_count = self.db.count_completions_in_period(self.id, monday, monday + timedelta(days=7), limit=self.periodicity)
             return week_count < self.periodicity
 
         return False
 
 
 
-if __name__ == "__main__":
+def run():
 
     """
     Entry point for the Habit Tracker CLI application.
@@ -135,9 +141,9 @@ if __name__ == "__main__":
     3. If the user chooses "Run CLI", they can:
        - Use the current database
        - Reset to default habits (resets the database to sample habits)
-       - Then launches `cli.py` via subprocess
+       - Then opens the CLI menu by calling `cli.run()`
        
-    4. For other options, the corresponding script is run via subprocess.
+    4. For other options, the corresponding module's `run()` is called in the same process.
     
     Notes:
     - The default habits table is for demonstration purposes.
@@ -147,8 +153,7 @@ if __name__ == "__main__":
 
     print("\n🟢 Welcome to Habit Tracker CLI!\n")
     print("Here’s a sample of default habits to get you started:\n")
-    print(f"{'ID':<3} | {'Habit Name':<20} | {'Freq':<6} | {'Periodicity':<11} | "
-          f"{'Current':<7} | {'Longest':<7} | {'Recent Completions'}")
+    print(ROW_FMT('ID', 'Habit Name', 'Freq', 'Periodicity', 'Current', 'Longest', 'Recent Completions'))
     print("-" * 100)
 
     
@@ -162,16 +167,17 @@ if __name__ == "__main__":
 
 
     now = datetime.now()
+    daily_recent = format_recent_completions(28, now)
+    weekly_recent = format_recent_completions(8, now - timedelta(days=now.weekday()))
     for idx, h in enumerate(default_habits_data, start=1):
         if h['frequency'] == 'daily':
             current = longest = 28
-            recent = f"28 completions, last: {now.strftime('%Y-%m-%d')}"
+            recent = daily_recent
         else:
             current = longest = 4
-            recent = f"8 completions, last: {(now - timedelta(days=now.weekday())).strftime('%Y-%m-%d')}"
+            recent = weekly_recent
 
-        print(f"{idx:<3} | {h['name']:<20} | {h['frequency']:<6} | {h['periodicity']:<11} | "
-              f"{current:<7} | {longest:<7} | {recent}")
+        print(ROW_FMT(idx, h['name'], h['frequency'], h['periodicity'], current, longest, recent))
 
     
     print("\nℹ️  These are default habits for demonstration purposes.")
@@ -200,17 +206,24 @@ if __name__ == "__main__":
         ).ask()
 
         if choice == "🔄 Reset to default habits":
-            db = Database()
-            db.reset_to_default()   
+            Database.get().reset_to_default()   
             print("\n✅ Database has been reset to default habits.\n")
 
-        subprocess.run(["py", "cli.py"])
+        import cli
+        cli.run()
 
     elif move_to == "🗄 Run database.py":
-        subprocess.run(["py", "database.py"])
+        import database
+        database.run()
 
     elif move_to == "📊 Run analytics.py":
-        subprocess.run(["py", "analytics.py"])
+        import analytics
+        analytics.run()
 
     else:
-        print("\n✅ Exiting Habit Tracker. Goodbye!\n")
\ No newline at end of file
+        print("\n✅ Exiting Habit Tracker. Goodbye!\n")
+
+
+
+if __name__ == "__main__":
+    run()
@@ -3,26 +3,48 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 import pytest
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from main import Habit
-from database import Database
+from database import Database, longest_run, format_recent_completions
 from analytics import (
     recent_completions_fp,
     longest_streak_for_habit_fp,
     recent_completions_summary,
-    habit_longest_streak
+    habit_longest_streak,
+    longest_streak_all
 )
 
 
+@pytest.fixture(scope="session")
+def memory_db():
+
+    """Open one in-memory database shared by the whole test session."""
+
+    db = Database(":memory:")
+    yield db
+    db.conn.close()
+
+
 @pytest.fixture
-def fresh_db(tmp_path):
+def fresh_db(memory_db):
+
+    """Empty the shared database before each test."""
+
+    memory_db.reset_empty()
+    yield memory_db
+
 
-    """Create a fresh database for each test."""
+@contextmanager
+def open_db(db_path):
 
-    db_path = tmp_path / "test_habits.db"
-    db = Database(str(db_path))
-    db.reset_empty() 
-    return db
+    """Open a file-backed database and close its connection when the block ends."""
+
+    db = Database(db_path)
+    try:
+        yield db
+    finally:
+        db.conn.close()
 
 
 @pytest.fixture
@@ -144,3 +166,293 @@ def test_period_summary(fresh_db):
     assert summary['completed'] == 1
 
     assert summary['missed'] >= 1
+
+
+def test_get_habit_id(fresh_db):
+
+    """Test that a habit can be looked up by its name."""
+
+    habit_id = fresh_db.add_habit("Named Habit", "weekly", 1)
+    assert fresh_db.get_habit_id("Named Habit") == habit_id
+    assert fresh_db.get_habit_id("Missing Habit") is None
+
+
+def test_recent_completions_summary_preloaded(fresh_db):
+
+    """Test that the completion summary can be built from preloaded completions."""
+
+    habit_id = fresh_db.add_habit("Summary Habit", "daily", 1)
+    now = datetime.now()
+    for i in range(2):
+        fresh_db.add_completion(habit_id, now - timedelta(days=i))
+    completions = fresh_db.load_completions(habit_id)
+    summary = recent_completions_summary(habit_id, completions)
+    assert summary == f"2 completions, last: {now.strftime('%Y-%m-%d')}"
+    assert len(completions) == 2
+
+
+def test_weekly_streaks(fresh_db):
+
+    """Test that weekly streaks only count weeks meeting the periodicity."""
+
+    habit_id = fresh_db.add_habit("Weekly Habit", "weekly", 2)
+    now = datetime.now()
+    monday = now - timedelta(days=now.weekday())
+    for week in (0, 1, 3):
+        for _ in range(2):
+            fresh_db.add_completion(habit_id, monday - timedelta(days=7 * week))
+    fresh_db.add_completion(habit_id, monday - timedelta(days=7 * 2))
+    habit = {"frequency": "weekly", "periodicity": 2}
+    streaks = fresh_db.get_streaks(habit_id)
+    assert streaks == {"current_streak": 2, "longest_streak": 2}
+    assert longest_streak_for_habit_fp(habit, fresh_db.load_completions(habit_id)) == 2
+
+
+def test_reset_to_default_fixture_data(fresh_db):
+
+    """Test that resetting to defaults recreates the fixture habits and their completions."""
+
+    fresh_db.reset_to_default()
+    habits = {h['name']: h['id'] for h in fresh_db.load_habits()}
+    assert len(habits) == 5
+    assert len(fresh_db.load_completions(habits["Drink Water"])) == 84
+    assert len(fresh_db.load_completions(habits["Clean Room"])) == 8
+    assert fresh_db.get_streaks(habits["Stretch"])['longest_streak'] == 28
+
+
+def test_load_recent_completions(fresh_db):
+
+    """Test that recent completions are unique, newest first and limited to n."""
+
+    habit_id = fresh_db.add_habit("Recent Unique Habit", "daily", 2)
+    now = datetime.now()
+    dates = [now - timedelta(days=i) for i in range(4)]
+    for d in dates:
+        fresh_db.add_completion(habit_id, d)
+        fresh_db.add_completion(habit_id, d)
+    assert fresh_db.load_recent_completions(habit_id, 3) == [d.date() for d in dates[:3]]
+
+
+def test_get_completion_stats(fresh_db):
+
+    """Test that completion count and last completion are computed in SQL."""
+
+    habit_id = fresh_db.add_habit("Stats Habit", "daily", 1)
+    assert fresh_db.get_completion_stats(habit_id) == (0, None)
+    now = datetime.now()
+    fresh_db.add_completion(habit_id, now - timedelta(days=1))
+    fresh_db.add_completion(habit_id, now)
+    assert fresh_db.get_completion_stats(habit_id) == (2, now)
+
+
+def test_load_habit(fresh_db):
+
+    """Test that a single habit is loaded by ID and hydrated by Habit.from_db."""
+
+    habit_id = fresh_db.add_habit("Single Habit", "weekly", 3)
+    assert fresh_db.load_habit(habit_id)['name'] == "Single Habit"
+    assert fresh_db.load_habit(habit_id + 1) is None
+    habit = Habit.from_db(habit_id, db_instance=fresh_db)
+    assert (habit.name, habit.frequency, habit.periodicity) == ("Single Habit", "weekly", 3)
+
+
+def test_fixture_data_not_regenerated(tmp_path):
+
+    """Test that reopening a database with habits does not add fixture habits again."""
+
+    db_path = str(tmp_path / "reopen_habits.db")
+    with open_db(db_path) as db:
+        db.delete_habit(db.get_habit_id("Stretch"))
+    with open_db(db_path) as reopened:
+        assert reopened.get_habit_id("Stretch") is None
+        assert len(reopened.load_habits()) == 4
+
+
+def test_count_habits_completed_today_and_week(fresh_db):
+
+    """Test that today's and this week's completed habits are counted in one call."""
+
+    habit1_id = fresh_db.add_habit("Week1", "daily", 1)
+    habit2_id = fresh_db.add_habit("Week2", "weekly", 1)
+    now = datetime.now()
+    monday = now - timedelta(days=now.weekday())
+    fresh_db.add_completion(habit1_id, now)
+    fresh_db.add_completion(habit1_id, now)
+    fresh_db.add_completion(habit2_id, monday - timedelta(days=1))
+    assert fresh_db.count_habits_completed_today_and_week(now.date()) == (1, 1)
+    fresh_db.add_completion(habit2_id, monday)
+    assert fresh_db.count_habits_completed_today_and_week(now.date())[1] == 2
+    fresh_db.delete_habit(habit1_id)
+    assert fresh_db.count_habits_completed_today_and_week(now.date()) == (0, 1)
+    assert fresh_db.load_completions(habit1_id) == []
+
+
+def test_overview_snapshot(fresh_db):
+
+    """Test that the overview snapshot matches the per-habit streak and completion queries."""
+
+    habit1_id = fresh_db.add_habit("Snapshot1", "daily", 1)
+    fresh_db.add_habit("Snapshot2", "weekly", 1)
+    now = datetime.now()
+    for i in range(3):
+        fresh_db.add_completion(habit1_id, now - timedelta(days=i))
+    snapshot = {h['id']: h for h in fresh_db.overview_snapshot()}
+    assert snapshot[habit1_id]['count'] == 3
+    assert snapshot[habit1_id]['last'] == now
+    assert snapshot[habit1_id]['current_streak'] == fresh_db.get_streaks(habit1_id)['current_streak'] == 3
+    empty = next(h for h in snapshot.values() if h['name'] == "Snapshot2")
+    assert (empty['count'], empty['last'], empty['longest_streak']) == (0, None, 0)
+
+
+def test_longest_run():
+
+    """Test that the longest run of consecutive periods is found across gaps."""
+
+    assert longest_run([], 1) == 0
+    assert longest_run([1, 2, 3, 5, 6, 10], 1) == 3
+    assert longest_run([0, 7, 21, 28, 35, 42], 7) == 4
+
+
+def test_fixture_data_after_reset_empty(tmp_path):
+
+    """Test that fixtures are added once, skipped for emptied-by-hand databases, and restored after reset_empty."""
+
+    db_path = str(tmp_path / "fixture_habits.db")
+    with open_db(db_path) as db:
+        for h in db.load_habits():
+            db.delete_habit(h['id'])
+    with open_db(db_path) as reopened:
+        assert reopened.load_habits() == []
+        reopened.reset_empty()
+    with open_db(db_path) as refilled:
+        assert len(refilled.load_habits()) == 5
+
+
+def test_period_summary_weekly(fresh_db):
+
+    """Test that the weekly summary only covers weekly habits and counts completions since Monday."""
+
+    weekly_id = fresh_db.add_habit("Weekly1", "weekly", 2)
+    fresh_db.add_habit("Weekly2", "weekly", 1)
+    daily_id = fresh_db.add_habit("Daily1", "daily", 1)
+    now = datetime.now()
+    monday = datetime(now.year, now.month, now.day) - timedelta(days=now.weekday())
+    fresh_db.add_completion(weekly_id, monday)
+    fresh_db.add_completion(weekly_id, now)
+    fresh_db.add_completion(daily_id, now)
+    assert fresh_db.period_summary("weekly") == {"completed": 1, "missed": 1}
+    assert fresh_db.period_summary("daily") == {"completed": 1, "missed": 0}
+
+
+def test_completions_in_current_period(fresh_db):
+
+    """Test that only completions in the habit's current period are counted."""
+
+    habit_id = fresh_db.add_habit("Period Habit", "daily", 3)
+    now = datetime.now()
+    fresh_db.add_completion(habit_id, now)
+    fresh_db.add_completion(habit_id, now)
+    fresh_db.add_completion(habit_id, now - timedelta(days=1))
+    assert fresh_db.completions_in_current_period(habit_id) == 2
+    today = now.date()
+    assert fresh_db.count_completions_in_period(habit_id, today - timedelta(days=1), today + timedelta(days=1)) == 3
+    assert fresh_db.count_completions_in_period(habit_id, today - timedelta(days=1), today + timedelta(days=1), limit=2) == 2
+
+
+def test_habit_cache_invalidation(fresh_db):
+
+    """Test that cached habits reflect additions and deletions."""
+
+    habit_id = fresh_db.add_habit("Cached Habit", "daily", 1)
+    assert fresh_db.load_habit(habit_id)['name'] == "Cached Habit"
+    other_id = fresh_db.add_habit("Other Habit", "weekly", 1)
+    assert [h['id'] for h in fresh_db.load_habits("weekly")] == [other_id]
+    fresh_db.delete_habit(habit_id)
+    assert fresh_db.load_habit(habit_id) is None
+    fresh_db.load_habits()[0]['name'] = "Changed"
+    assert fresh_db.load_habit(other_id)['name'] == "Other Habit"
+
+
+def test_completion_queries_use_covering_index(fresh_db):
+
+    """Test that per-habit completion range queries are answered from the composite index."""
+
+    plan = fresh_db.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM completions "
+        "WHERE habit_id = ? AND completion_date >= ? AND completion_date < ?",
+        (1, "2024-01-01", "2024-01-08")
+    ).fetchall()
+    assert any("COVERING INDEX idx_completions_habit_date" in row[3] for row in plan)
+    assert fresh_db.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()
+
+
+def test_habit_cache_updated_in_place(fresh_db):
+
+    """Test that adding and deleting habits updates the loaded cache without rebuilding it."""
+
+    cache = fresh_db._load_habits_cache()
+    habit_id = fresh_db.add_habit("In Place", "weekly", 2)
+    assert fresh_db._load_habits_cache() is cache
+    assert fresh_db.load_habit(habit_id) == dict(fresh_db.conn.execute("SELECT * FROM habits WHERE id = ?", (habit_id,)).fetchone())
+    fresh_db.delete_habit(habit_id)
+    assert fresh_db._load_habits_cache() is cache
+    assert habit_id not in cache
+
+
+def test_habit_from_record(fresh_db):
+
+    """Test that Habit.from_record hydrates habits from already loaded records."""
+
+    habit_id = fresh_db.add_habit("Record Habit", "daily", 2)
+    habit = Habit.from_record(fresh_db.load_habits()[0], db_instance=fresh_db)
+    assert (habit.id, habit.name, habit.periodicity) == (habit_id, "Record Habit", 2)
+    assert habit.db is fresh_db
+
+
+def test_load_streaks_matches_python(fresh_db):
+
+    """Test the SQL streak query on gappy and future-dated completions against the Python longest streak."""
+
+    daily_id = fresh_db.add_habit("Gappy Daily", "daily", 2)
+    weekly_id = fresh_db.add_habit("Gappy Weekly", "weekly", 1)
+    future_daily_id = fresh_db.add_habit("Future Daily", "daily", 1)
+    future_weekly_id = fresh_db.add_habit("Future Weekly", "weekly", 1)
+    fresh_db.add_habit("No Completions", "daily", 1)
+    now = datetime.now()
+    rows = [(daily_id, now - timedelta(days=d)) for d in (0, 0, 1, 1, 2, 4, 4, 5, 5, 6, 6, 7, 7)]
+    rows += [(weekly_id, now - timedelta(weeks=w)) for w in (1, 2, 4)]
+    rows += [(future_daily_id, now + timedelta(days=d)) for d in (-1, 0, 1)]
+    rows += [(future_weekly_id, now + timedelta(weeks=w)) for w in (-1, 0, 1, 2)]
+    fresh_db.add_completions_bulk(rows)
+    streaks = fresh_db.load_streaks()
+    assert streaks[daily_id] == {"current_streak": 2, "longest_streak": 4}
+    assert streaks[weekly_id] == {"current_streak": 0, "longest_streak": 2}
+    assert streaks[future_daily_id] == {"current_streak": 2, "longest_streak": 3}
+    assert streaks[future_weekly_id] == {"current_streak": 2, "longest_streak": 4}
+    for h in fresh_db.load_habits():
+        expected = streaks.get(h['id'], {"current_streak": 0, "longest_streak": 0})
+        assert fresh_db.get_streaks(h['id']) == expected
+        assert longest_streak_for_habit_fp(h, fresh_db.load_completions(h['id'])) == expected['longest_streak']
+
+
+def test_longest_streak_all(fresh_db):
+
+    """Test that the overall longest streak uses snapshot streaks, given completions or loaded completions."""
+
+    short_id = fresh_db.add_habit("Short", "daily", 1)
+    long_id = fresh_db.add_habit("Long", "daily", 1)
+    now = datetime.now()
+    fresh_db.add_completions_bulk([(short_id, now)] + [(long_id, now - timedelta(days=i)) for i in range(3)])
+    assert longest_streak_all(fresh_db.overview_snapshot()) == {"habits": ["Long"], "longest_streak": 3}
+    habits = fresh_db.load_habits()
+    completions = {h['id']: fresh_db.load_completions(h['id']) for h in habits}
+    assert longest_streak_all(habits, completions) == {"habits": ["Long"], "longest_streak": 3}
+    assert longest_streak_all(habits, db_instance=fresh_db) == {"habits": ["Long"], "longest_streak": 3}
+
+
+def test_format_recent_completions():
+
+    """Test the shared completion summary used by every overview table."""
+
+    assert format_recent_completions(0, None) == "0 completions"
+    assert format_recent_completions(3, datetime(2024, 5, 6, 7, 8)) == "3 completions, last: 2024-05-06"